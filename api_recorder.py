@@ -0,0 +1,160 @@
+import atexit
+import gzip
+import hashlib
+import json
+import os
+import random
+import shutil
+import threading
+import time
+import zlib
+
+
+class APIRecorder:
+    """
+    Record translation API request/response pairs with their latencies and replay them offline.
+
+    Modes:
+        live   - call the endpoint (default)
+        record - call the endpoint and add request, response and latency to the store;
+                 a run is written to its own gzip file and appended to the store on close
+        replay - serve responses from the store, sleeping for the recorded latency
+    """
+
+    def __init__(self, mode="live", store_path="api_recordings.jsonl.gz", latency_scale=1.0, 
+                 latency_mode="recorded", seed=0):
+        if mode not in ("live", "record", "replay"):
+            raise ValueError(f"Unknown API mode: {mode}")
+        if latency_mode not in ("recorded", "sampled"):
+            raise ValueError(f"Unknown latency mode: {latency_mode}")
+
+        self.mode = mode
+        self.store_path = store_path
+        self.latency_scale = latency_scale
+        self.latency_mode = latency_mode
+        self.random = random.Random(seed)
+        self.recordings = {}
+        self.endpoint_latencies = {}
+        self.loaded = False
+        self.writer = None
+        self.run_path = None
+        self.lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """Configure the recorder from BHASHA_API_* environment variables."""
+        return cls(mode=os.environ.get("BHASHA_API_MODE", "live"),
+                   store_path=os.environ.get("BHASHA_API_STORE", "api_recordings.jsonl.gz"),
+                   latency_scale=float(os.environ.get("BHASHA_API_LATENCY_SCALE", "1.0")),
+                   latency_mode=os.environ.get("BHASHA_API_LATENCY_MODE", "recorded"),
+                   seed=int(os.environ.get("BHASHA_API_SEED", "0")))
+
+    @staticmethod
+    def get_request_key(endpoint, request):
+        request_text = json.dumps(request, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(f"{endpoint}\n{request_text}".encode('utf-8')).hexdigest()
+
+    def iter_store_records(self):
+        """Yield the records of every complete gzip member (one per recording run) in the store."""
+        with open(self.store_path, 'rb') as f:
+            data = f.read()
+        while data:
+            decompressor = zlib.decompressobj(wbits=31)  # gzip member
+            try:
+                member = decompressor.decompress(data)
+            except zlib.error as e:
+                print(f"Skipping unreadable end of {self.store_path}: {e}")
+                return
+            if not decompressor.eof:
+                print(f"Skipping truncated end of {self.store_path}")
+                return
+            data = decompressor.unused_data
+            for line in member.decode('utf-8').splitlines():
+                if line.strip():
+                    yield json.loads(line)
+
+    def load_recordings(self):
+        """
+        Load the store; later recordings of the same request replace earlier ones.
+        Keys are recomputed from the stored requests, so a changed key scheme needs no re-recording.
+        """
+        if not os.path.exists(self.store_path):
+            raise FileNotFoundError(f"No API recordings at {self.store_path}; "
+                                    f"set BHASHA_API_STORE or record them with BHASHA_API_MODE=record")
+        recordings = {}
+        endpoint_latencies = {}
+        for record in self.iter_store_records():
+            key = self.get_request_key(record['endpoint'], record['request'])
+            recordings[key] = record
+            endpoint_latencies.setdefault(record['endpoint'], []).append(record['latency'])
+
+        self.recordings = recordings
+        self.endpoint_latencies = endpoint_latencies
+        self.loaded = True
+
+    def save_recording(self, endpoint, request, response, latency):
+        record = {"endpoint": endpoint, "request": request, "response": response, "latency": round(latency, 4)}
+        with self.lock:
+            # One gzip stream per recording run, written beside the store until close
+            if self.writer is None:
+                self.run_path = f"{self.store_path}.{os.getpid()}.run"
+                self.writer = gzip.open(self.run_path, 'wt', encoding='utf-8')
+                atexit.register(self.close)
+            self.writer.write(json.dumps(record, ensure_ascii=False))
+            self.writer.write("\n")
+
+    def close(self):
+        """
+        Finish the recording run and append it to the store. The store is replaced atomically,
+        so a run that dies before closing leaves the store as it was.
+        """
+        with self.lock:
+            if self.writer is None:
+                return
+            self.writer.close()
+            self.writer = None
+
+            new_store_path = f"{self.store_path}.{os.getpid()}.new"
+            with open(new_store_path, 'wb') as new_store:
+                if os.path.exists(self.store_path):
+                    with open(self.store_path, 'rb') as store:
+                        shutil.copyfileobj(store, new_store)
+                with open(self.run_path, 'rb') as run:
+                    shutil.copyfileobj(run, new_store)
+            os.replace(new_store_path, self.store_path)
+            os.remove(self.run_path)
+
+    def get_replay_latency(self, record):
+        if self.latency_mode == "sampled":
+            latency = self.random.choice(self.endpoint_latencies[record['endpoint']])
+        else:
+            latency = record['latency']
+        return latency * self.latency_scale
+
+    def call(self, endpoint, request, send_request):
+        """
+        Serve a request according to the recorder mode.
+
+        Args:
+            endpoint (str): Name of the endpoint, e.g. "gpt" or "sarvam"
+            request (dict): JSON-serialisable request that identifies the response
+            send_request (callable): Performs the live call and returns the response
+        """
+        if self.mode == "live":
+            return send_request()
+
+        if self.mode == "replay":
+            with self.lock:
+                if not self.loaded:
+                    self.load_recordings()
+            key = self.get_request_key(endpoint, request)
+            if key not in self.recordings:
+                raise KeyError(f"No recorded response for {endpoint} request {key}")
+            record = self.recordings[key]
+            time.sleep(self.get_replay_latency(record))
+            return record['response']
+
+        start_time = time.perf_counter()
+        response = send_request()
+        self.save_recording(endpoint, request, response, time.perf_counter() - start_time)
+        return response
@@ -0,0 +1,112 @@
+from array import array
+
+
+class TextBlock:
+    """
+    A block of document text with its provenance.
+
+    Attributes:
+        text (str): Stripped block text
+        pages (tuple): Page numbers the block has text on, starting from 1
+        bboxes (tuple): (x0, y0, x1, y1) of the block on each of those pages
+        kind (str): "text", "paragraph" or "footnote"
+        para_id (int): Position of a paragraph or footnote among blocks of its kind;
+            None for raw blocks straight out of extraction
+    """
+    __slots__ = ("text", "pages", "bboxes", "kind", "para_id")
+
+    def __init__(self, text, pages, bboxes, kind="text", para_id=None):
+        self.text = text
+        self.pages = pages
+        self.bboxes = bboxes
+        self.kind = kind
+        self.para_id = para_id
+
+    @property
+    def page(self):
+        """First page of the block."""
+        return self.pages[0]
+
+    @property
+    def last_page(self):
+        return self.pages[-1]
+
+    @property
+    def bbox(self):
+        """Bbox of the block on its first page."""
+        return self.bboxes[0]
+
+    def __repr__(self):
+        return f"TextBlock(pages={self.pages}, kind={self.kind!r}, para_id={self.para_id}, text={self.text[:40]!r})"
+
+    def to_dict(self):
+        return {
+            "para_id": self.para_id,
+            "kind": self.kind,
+            "page": self.page,
+            "last_page": self.last_page,
+            "pages": list(self.pages),
+            "bboxes": [list(bbox) for bbox in self.bboxes],
+            "source": self.text
+        }
+
+
+class BlockStore:
+    """
+    Blocks of one kind stored compactly: each block's text is kept as the one string
+    extraction or merging produced, and their pages and bboxes are kept in flat arrays.
+    Indexing or iterating returns TextBlock views that share that string, so no stage
+    copies block text.
+    """
+    __slots__ = ("kind", "texts", "span_starts", "pages", "bboxes")
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.texts = []
+        # Block i has pages[span_starts[i]:span_starts[i + 1]], with 4 bbox values per page
+        self.span_starts = array('l', [0])
+        self.pages = array('l')
+        self.bboxes = array('d')
+
+    def append(self, block):
+        self.texts.append(block.text)
+        self.pages.extend(block.pages)
+        for bbox in block.bboxes:
+            self.bboxes.extend(bbox)
+        self.span_starts.append(len(self.pages))
+
+    def __len__(self):
+        return len(self.texts)
+
+    def __getitem__(self, i):
+        if not 0 <= i < len(self):
+            raise IndexError(f"{self.kind} block index out of range: {i}")
+        span = range(self.span_starts[i], self.span_starts[i + 1])
+        pages = tuple(self.pages[j] for j in span)
+        bboxes = tuple(tuple(self.bboxes[4 * j:4 * j + 4]) for j in span)
+        return TextBlock(self.texts[i], pages, bboxes, kind=self.kind, para_id=i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+
+def merge_text_blocks(blocks):
+    """
+    Merge consecutive text blocks into one paragraph block,
+    keeping one bbox per page the paragraph runs across.
+    A single block is returned as is, without copying its text.
+    """
+    if len(blocks) == 1:
+        return blocks[0]
+
+    page_bboxes = {}
+    for block in blocks:
+        for page, bbox in zip(block.pages, block.bboxes):
+            if page in page_bboxes:
+                x0, y0, x1, y1 = page_bboxes[page]
+                bbox = (min(x0, bbox[0]), min(y0, bbox[1]), max(x1, bbox[2]), max(y1, bbox[3]))
+            page_bboxes[page] = bbox
+
+    text = " ".join(block.text for block in blocks)
+    return TextBlock(text, tuple(page_bboxes), tuple(page_bboxes.values()), kind="paragraph")
@@ -3,12 +3,18 @@ from translate_api import *
 from pdf_extraction import *
 from save_output import *
 from translation_eval import *
+from revision_diff import *
+import argparse
+from itertools import chain
 import os
 import numpy as np
 import pandas as pd
 from tqdm import tqdm
 import re
 
+# Terms enforced on top of the glossary spreadsheet
+DEFAULT_GLOSSARY_TERMS = {"Maxim": "नियम"}
+
 def get_glossary(excel_file_path):
     try:
         # Read the Excel file
@@ -29,6 +35,55 @@ def get_glossary(excel_file_path):
         return None
 
 
+def get_glossary_index(glossary_df):
+    """
+    Build a lookup index over the English and Transliteration columns of the glossary.
+    Terms are keyed by their first word, so a block is matched in a single pass over its words.
+    Matching is exact and whole-word (case-insensitive): plurals and other word forms
+    such as "maxims" do not match "maxim".
+    """
+    # Default terms are selected per paragraph like any other, and win over spreadsheet duplicates
+    glossary_entries = list(DEFAULT_GLOSSARY_TERMS.items())
+    if glossary_df is not None:
+        for column in ['English', 'Transliteration']:
+            glossary_entries.extend(zip(glossary_df[column], glossary_df['Hindi']))
+
+    glossary_index = {}
+    indexed_terms = set()
+    for term, hindi in glossary_entries:
+        term_words = tuple(re.findall(r'\w+', str(term).lower()))
+        if not term_words or term_words in indexed_terms:
+            continue
+        indexed_terms.add(term_words)
+        glossary_index.setdefault(term_words[0], []).append((term_words, term, hindi))
+
+    # Longer phrases first, so "inward turned" wins over "inward"
+    for candidates in glossary_index.values():
+        candidates.sort(key=lambda candidate: len(candidate[0]), reverse=True)
+    return glossary_index
+
+
+def get_glossary_terms(block, glossary_index):
+    """
+    Find the glossary entries present in a block, returned as {term: Hindi}
+    """
+    glossary_terms = {}
+    if not glossary_index:
+        return glossary_terms
+
+    block_words = re.findall(r'\w+', block.lower())
+    i = 0
+    while i < len(block_words):
+        matched_len = 1
+        for term_words, term, hindi in glossary_index.get(block_words[i], ()):
+            if tuple(block_words[i:i + len(term_words)]) == term_words:
+                glossary_terms[term] = hindi
+                matched_len = len(term_words)
+                break
+        i += matched_len
+    return glossary_terms
+
+
 def get_glossary_transformed_block(block, glossary_df):
     try:
         # Create dictionaries for English and Transliteration mappings
@@ -57,6 +112,17 @@ def get_glossary_transformed_block(block, glossary_df):
         return block
 
 
+def get_output_text_paragraphs(translated_paragraphs, footnote_text_blocks, translated_footnotes):
+    """
+    Lay out translated paragraphs followed by the page-labelled footnotes
+    """
+    output_text_paragraphs = list(translated_paragraphs)
+    for block, translated_block in zip(footnote_text_blocks, translated_footnotes):
+        output_text_paragraphs.append(f"Page num: {block.page}\n")
+        output_text_paragraphs.append(translated_block)
+    return output_text_paragraphs
+
+
 def translate_document(input_pdf_path, output_path, glossary_df=None, src_lang='English', tgt_lang=None):
     """
     Main function to handle the translation pipeline
@@ -64,38 +130,111 @@ def translate_document(input_pdf_path, output_path, glossary_df=None, src_lang='
     try:
         
         # 1. Parse pdf and extract text blocks
-        extracted_text_blocks, footnote_text_blocks = extract_text_blocks_from_pdf(input_pdf_path)
-        complete_paragraph_blocks = get_paragraph_blocks(extracted_text_blocks)
+        complete_paragraph_blocks, footnote_text_blocks = extract_paragraph_blocks_from_pdf(input_pdf_path)
         
+        glossary_index = get_glossary_index(glossary_df)
         print("Text block extraction done!")
         
         # 2. Translate text blocks
-        translated_text_paragraphs = []
+        translated_paragraphs = []
+        glossary_fingerprints = []
         for block in tqdm(complete_paragraph_blocks):
-            block = block.strip()
-            translated_block = translate_text_gpt(block, tgt_lang)
-            translated_text_paragraphs.append(translated_block)
+            glossary_terms = get_glossary_terms(block.text, glossary_index)
+            translated_block = translate_text_gpt(block.text, tgt_lang, glossary_terms)
+            translated_paragraphs.append(translated_block)
+            glossary_fingerprints.append(get_glossary_fingerprint(glossary_terms))
         
         print('\n\n\n')
         print("========Footnotes========")
+        translated_footnotes = []
         for block in tqdm(footnote_text_blocks):
-            translated_block = translate_text_gpt(block[1], tgt_lang)
-            translated_text_paragraphs.append(f"Page num: {block[0]}\n")
-            translated_text_paragraphs.append(translated_block)
+            glossary_terms = get_glossary_terms(block.text, glossary_index)
+            translated_block = translate_text_gpt(block.text, tgt_lang, glossary_terms)
+            translated_footnotes.append(translated_block)
+            glossary_fingerprints.append(get_glossary_fingerprint(glossary_terms))
             print()
 
         
         # 3. Save the translated text to output file
+        translated_text_paragraphs = get_output_text_paragraphs(translated_paragraphs, footnote_text_blocks, translated_footnotes)
         result = save_output_text(translated_text_paragraphs, output_path)
+
+        # 4. Keep aligned source/target pairs for incremental re-translation of revised editions
+        save_translation_pairs(chain(complete_paragraph_blocks, footnote_text_blocks), translated_paragraphs + translated_footnotes, 
+                               get_pairs_path(output_path), tgt_lang, glossary_fingerprints)
         #return (paragraphs, translated_paragraphs, output_path) if os.path.exists(output_path) else result
         
     except Exception as e:
         print("Error: ", e)
         return f"Error in translation process: {str(e)}"
 
+
+def get_revision_pairs(blocks, glossary_index, tgt_lang):
+    """
+    Reuse keys of a revised edition's blocks, with the glossary terms their prompts would use
+    """
+    revision_pairs = []
+    for block in blocks:
+        glossary_terms = get_glossary_terms(block.text, glossary_index)
+        revision_pairs.append({"source": block.text, "tgt_lang": tgt_lang, "glossary_terms": glossary_terms, 
+                               "glossary": get_glossary_fingerprint(glossary_terms)})
+    return revision_pairs
+
+
+def translate_document_revision(input_pdf_path, output_path, previous_pairs_path, glossary_df=None, src_lang='English', tgt_lang=None):
+    """
+    Re-translate a revised edition of a document, translating only inserted or modified
+    paragraphs and reusing the previous run's translations for everything else
+    """
+    try:
+
+        # 1. Parse the revised pdf and align it against the previous run
+        complete_paragraph_blocks, footnote_text_blocks = extract_paragraph_blocks_from_pdf(input_pdf_path)
+        glossary_index = get_glossary_index(glossary_df)
+
+        previous_pairs = load_translation_pairs(previous_pairs_path)
+        previous_paragraph_pairs = [pair for pair in previous_pairs if pair["kind"] != "footnote"]
+        previous_footnote_pairs = [pair for pair in previous_pairs if pair["kind"] == "footnote"]
+        paragraph_pairs = get_revision_pairs(complete_paragraph_blocks, glossary_index, tgt_lang)
+        footnote_pairs = get_revision_pairs(footnote_text_blocks, glossary_index, tgt_lang)
+        translated_paragraphs = align_revision_paragraphs(previous_paragraph_pairs, paragraph_pairs)
+        translated_footnotes = align_revision_paragraphs(previous_footnote_pairs, footnote_pairs)
+
+        changed_paragraphs = [i for i, target in enumerate(translated_paragraphs) if target is None]
+        changed_footnotes = [i for i, target in enumerate(translated_footnotes) if target is None]
+        print(f"Reusing {len(translated_paragraphs) - len(changed_paragraphs)} of {len(translated_paragraphs)} paragraphs "
+              f"and {len(translated_footnotes) - len(changed_footnotes)} of {len(translated_footnotes)} footnotes")
+
+        # 2. Translate only the inserted or modified blocks
+        for i in tqdm(changed_paragraphs):
+            block = complete_paragraph_blocks[i]
+            translated_paragraphs[i] = translate_text_gpt(block.text, tgt_lang, paragraph_pairs[i]["glossary_terms"])
+
+        for i in tqdm(changed_footnotes):
+            block = footnote_text_blocks[i]
+            translated_footnotes[i] = translate_text_gpt(block.text, tgt_lang, footnote_pairs[i]["glossary_terms"])
+
+        # 3. Rebuild the full output file from reused and new segments
+        translated_text_paragraphs = get_output_text_paragraphs(translated_paragraphs, footnote_text_blocks, translated_footnotes)
+        save_output_text(translated_text_paragraphs, output_path)
+
+        glossary_fingerprints = [pair["glossary"] for pair in paragraph_pairs + footnote_pairs]
+        save_translation_pairs(chain(complete_paragraph_blocks, footnote_text_blocks), translated_paragraphs + translated_footnotes, 
+                               get_pairs_path(output_path), tgt_lang, glossary_fingerprints)
+
+    except Exception as e:
+        print("Error: ", e)
+        return f"Error in translation process: {str(e)}"
+
 if __name__== "__main__":
 
-    input_pdf_path = "docs/seer_En.pdf"
+    parser = argparse.ArgumentParser(description="Translate a PDF document from English to an Indic language")
+    parser.add_argument("--input_pdf", default="docs/seer_En.pdf")
+    parser.add_argument("--previous_pairs", default=None, 
+                        help="_pairs.jsonl of a previous run; re-translates only the paragraphs changed since then")
+    args = parser.parse_args()
+
+    input_pdf_path = args.input_pdf
     glossary_excel_path = "docs/glossary-en-hi-heartfulness.xlsx"
     input_ground_truth_pdf_path = "docs/seer_hindi.pdf"
     src_lang, tgt_lang =  "English", "Hindi"
@@ -109,4 +248,8 @@ if __name__== "__main__":
     input_filename = Path(input_pdf_path).stem
     output_path = os.path.join(output_dir, f"translated_{input_filename}_GPT4o_{tgt_lang}_2.txt")
     
-    translate_document(input_pdf_path, output_path, glossary_df, src_lang=src_lang, tgt_lang=tgt_lang)
+    if args.previous_pairs:
+        translate_document_revision(input_pdf_path, output_path, args.previous_pairs, glossary_df, 
+                                    src_lang=src_lang, tgt_lang=tgt_lang)
+    else:
+        translate_document(input_pdf_path, output_path, glossary_df, src_lang=src_lang, tgt_lang=tgt_lang)
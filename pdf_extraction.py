@@ -3,6 +3,7 @@ import nltk
 from pathlib import Path
 import os
 import re
+from document_model import TextBlock, BlockStore, merge_text_blocks
 
 def is_footnote(text: str, y_position: float, page_height: float) -> bool:
         """Identify footnotes based on content and position."""
@@ -19,9 +20,8 @@ def is_footnote(text: str, y_position: float, page_height: float) -> bool:
         return is_footnote_format and is_bottom_position and len(text) < 256
 
 
-def extract_text_blocks_from_pdf(pdf_path, start_page=0, end_page=-1):
-    extracted_text_blocks = []
-    footnote_text_blocks = []
+def iter_text_blocks_from_pdf(pdf_path, start_page=0, end_page=-1):
+    """Yield text and footnote blocks page by page, so callers need not hold every raw block."""
     doc = fitz.open(pdf_path)
 
     # Ensure the page range is valid
@@ -34,22 +34,38 @@ def extract_text_blocks_from_pdf(pdf_path, start_page=0, end_page=-1):
         blocks = page.get_text("blocks", sort=True)
         
         for block in blocks:
-            text = block[4]  # The text is the fifth element in the block tuple
+            text = block[4].strip()  # The text is the fifth element in the block tuple
             y_position = block[1]
 
             # Skip empty blocks and page numbers
-            if not text.strip() or text.strip().isdigit(): 
+            if not text or text.isdigit(): 
                  continue 
             
             # Footnotes to be stored separately
-            elif is_footnote(text.strip(), y_position, page.rect.height):
-                footnote_text_blocks.append((page_num +1, text.strip()))
+            elif is_footnote(text, y_position, page.rect.height):
+                yield TextBlock(text, (page_num + 1,), (block[:4],), kind="footnote")
 
             # Text blocks
             else:
-                extracted_text_blocks.append(text.strip())
+                yield TextBlock(text, (page_num + 1,), (block[:4],))
 
-    return (extracted_text_blocks, footnote_text_blocks)
+
+def extract_paragraph_blocks_from_pdf(pdf_path, start_page=0, end_page=-1):
+    """
+    Extract paragraphs and footnotes into BlockStores, merging text blocks as they are read
+    so raw blocks are released once their paragraph is stored.
+    """
+    footnote_text_blocks = BlockStore("footnote")
+
+    def iter_text_blocks():
+        for block in iter_text_blocks_from_pdf(pdf_path, start_page, end_page):
+            if block.kind == "footnote":
+                footnote_text_blocks.append(block)
+            else:
+                yield block
+
+    complete_paragraph_blocks = get_paragraph_blocks(iter_text_blocks())
+    return (complete_paragraph_blocks, footnote_text_blocks)
 
 def is_sentence_end(text):
     text = text.strip()
@@ -58,30 +74,30 @@ def is_sentence_end(text):
 
 
 def get_paragraph_blocks(text_blocks):
-    complete_para_blocks = []
-    continuing_block = ""
+    complete_para_blocks = BlockStore("paragraph")
+    continuing_blocks = []
     
-    for i, block in enumerate(text_blocks):
+    for block in text_blocks:
         
-        if not block.strip():
+        if not block.text:
             continue
 
         # First block
-        if not continuing_block:
-            continuing_block = block
+        if not continuing_blocks:
+            continuing_blocks.append(block)
             continue
 
         # Check if previous block is incomplete and current block starts with lowercase
-        if not is_sentence_end(continuing_block) and block.strip()[0].islower():
-            continuing_block = f"{continuing_block.strip()} {block.strip()}"
+        if not is_sentence_end(continuing_blocks[-1].text) and block.text[0].islower():
+            continuing_blocks.append(block)
         else:
-            # Add the continuing block to list and start a new one
-            complete_para_blocks.append(continuing_block.strip())
-            continuing_block = block
+            # Add the continuing blocks as one paragraph and start a new one
+            complete_para_blocks.append(merge_text_blocks(continuing_blocks))
+            continuing_blocks = [block]
 
     # Add the last paragraph
-    if continuing_block:
-        complete_para_blocks.append(continuing_block.strip())
+    if continuing_blocks:
+        complete_para_blocks.append(merge_text_blocks(continuing_blocks))
     
     return complete_para_blocks
    
@@ -89,17 +105,16 @@ def get_paragraph_blocks(text_blocks):
 
 # if __name__ == "__main__":
 #     input_pdf_path = "docs/seer_En.pdf"
-#     extracted_text_blocks, footnote_text_blocks = extract_text_blocks_from_pdf(input_pdf_path)
-#     complete_paragraph_blocks = get_paragraph_blocks(extracted_text_blocks)
+#     complete_paragraph_blocks, footnote_text_blocks = extract_paragraph_blocks_from_pdf(input_pdf_path)
 
 #     for block in complete_paragraph_blocks:
 
-#         print(block)
+#         print(block.text)
 #         print('-' * 80)
 #         print()
 #     print("====Footnotes====")
 #     for block in footnote_text_blocks:
 
-#         print("Page num: ", block[0])
-#         print(block[1])
+#         print("Page num: ", block.page)
+#         print(block.text)
     
\ No newline at end of file
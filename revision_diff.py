@@ -0,0 +1,53 @@
+import hashlib
+from difflib import SequenceMatcher
+
+
+def get_paragraph_hash(text):
+    """Hash a paragraph with whitespace normalised, so re-flowed text still matches."""
+    normalized_text = ' '.join(text.split())
+    return hashlib.sha1(normalized_text.encode('utf-8')).hexdigest()
+
+
+def get_glossary_fingerprint(glossary_terms):
+    """Short hash of the glossary terms a paragraph's prompt was built with."""
+    terms_text = '\n'.join(f"{term}\t{hindi}" for term, hindi in sorted(glossary_terms.items()))
+    return hashlib.sha1(terms_text.encode('utf-8')).hexdigest()[:12]
+
+
+def get_pair_key(pair):
+    """Reuse key of a paragraph: its source text, target language and glossary fingerprint."""
+    return f"{pair['tgt_lang']}:{pair['glossary']}:{get_paragraph_hash(pair['source'])}"
+
+
+def align_revision_paragraphs(previous_pairs, new_pairs):
+    """
+    Align the paragraphs of a revised edition against the previous run's source/target pairs.
+    A translation is only reused for the same source, target language and glossary terms.
+
+    Args:
+        previous_pairs (list): [{'source', 'tgt_lang', 'glossary', 'target'}] from the previous run
+        new_pairs (list): [{'source', 'tgt_lang', 'glossary'}] for the revised edition
+
+    Returns:
+        list: Reused translation for each new paragraph, or None where it has to be translated
+    """
+    previous_keys = [get_pair_key(pair) for pair in previous_pairs]
+    new_keys = [get_pair_key(pair) for pair in new_pairs]
+    aligned_targets = [None] * len(new_pairs)
+
+    # Unchanged runs of paragraphs, in document order
+    matcher = SequenceMatcher(None, previous_keys, new_keys, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            for k in range(i2 - i1):
+                aligned_targets[j1 + k] = previous_pairs[i1 + k]['target']
+
+    # Paragraphs that only moved are still reused by their key
+    key_to_target = {}
+    for pair_key, pair in zip(previous_keys, previous_pairs):
+        key_to_target.setdefault(pair_key, pair['target'])
+    for i, pair_key in enumerate(new_keys):
+        if aligned_targets[i] is None:
+            aligned_targets[i] = key_to_target.get(pair_key)
+
+    return aligned_targets
@@ -1,3 +1,5 @@
+import json
+import os
 
 
 def save_output_text(translated_list, output_path):
@@ -10,5 +12,34 @@ def save_output_text(translated_list, output_path):
         for text in translated_list:
             f.write(text)
             f.write("\n\n")
-            
-   
\ No newline at end of file
+
+
+def get_pairs_path(output_path):
+    """
+    Path of the aligned bilingual JSONL file stored next to the output file
+    """
+    return f"{os.path.splitext(output_path)[0]}_pairs.jsonl"
+
+
+def save_translation_pairs(blocks, translated_list, pairs_path, tgt_lang, glossary_fingerprints):
+    """
+    Save aligned source/target pairs, one JSON line per block with its page, bbox and kind,
+    plus the target language and glossary terms it was translated with,
+    so a revised edition can be re-translated incrementally
+    """
+    with open(pairs_path, 'w', encoding='utf-8') as f:
+        for block, translated_text, glossary_fingerprint in zip(blocks, translated_list, glossary_fingerprints):
+            pair = block.to_dict()
+            pair["tgt_lang"] = tgt_lang
+            pair["glossary"] = glossary_fingerprint
+            pair["target"] = translated_text
+            f.write(json.dumps(pair, ensure_ascii=False))
+            f.write("\n")
+
+
+def load_translation_pairs(pairs_path):
+    """
+    Load aligned source/target pairs saved by a previous run
+    """
+    with open(pairs_path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
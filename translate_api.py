@@ -4,9 +4,14 @@ import os
 from langchain_openai import ChatOpenAI
 from langchain.prompts import PromptTemplate
 import certifi
+from api_recorder import APIRecorder
 
 os.environ['SSL_CERT_FILE'] = certifi.where()
 os.environ["OPENAI_API_KEY"] = <api_key>)
+
+# Live by default; set BHASHA_API_MODE=record|replay for offline, deterministic runs
+api_recorder = APIRecorder.from_env()
+
 def translate_text_sarvam(text, target_language='hi-IN'):
 
     url = "https://api.sarvam.ai/translate"
@@ -24,14 +29,17 @@ def translate_text_sarvam(text, target_language='hi-IN'):
         "Content-Type": "application/json"
     }
 
-    response = requests.request("POST", url, json=payload, headers=headers)
-    if response.status_code == 200:
-        response = json.loads(response.text)
-        translated_text = response['translated_text']
-    else:
-        print("Failed with status code:", response.status_code)
+    def send_request():
+        response = requests.request("POST", url, json=payload, headers=headers)
+        if response.status_code == 200:
+            response = json.loads(response.text)
+            translated_text = response['translated_text']
+        else:
+            print("Failed with status code:", response.status_code)
 
-    return translated_text
+        return translated_text
+
+    return api_recorder.call("sarvam", payload, send_request)
 
 def translate_text(text, target_language="Hindi"):
     url = "http://100.123.252.79:5000/translate"
@@ -44,19 +52,27 @@ def translate_text(text, target_language="Hindi"):
         "Content-Type": "application/json"
     }
 
-    response = requests.post(url, json = payload, headers = headers)
+    def send_request():
+        response = requests.post(url, json = payload, headers = headers)
 
-    if response.status_code == 200:
-        response = response.json()
-        translated_text = response.get("translated_text", "")
-    
-    else:
-        print("Failed with status code:", response.status_code)
-    
-    return translated_text
+        if response.status_code == 200:
+            response = response.json()
+            translated_text = response.get("translated_text", "")
+        
+        else:
+            print("Failed with status code:", response.status_code)
+        
+        return translated_text
+
+    return api_recorder.call("translate", payload, send_request)
+
+# Model settings, shared by the client and the record/replay key
+GPT_CONFIG = {"model_name": "gpt-4o", "temperature": 0.3, "max_tokens": 512} # or gpt-4 if available
 
-def translate_text_gpt(text, target_language='Hindi'):
-    llm = ChatOpenAI(temperature=0.3, model_name="gpt-4o", max_tokens=512) # or gpt-4 if available
+def get_glossary_prompt(glossary_terms):
+    return " ".join(f'Translate "{term}" as "{hindi}".' for term, hindi in (glossary_terms or {}).items())
+
+def translate_text_gpt(text, target_language='Hindi', glossary_terms=None):
     prompt_template = """
     Act as a linguistic expert in translating documents and text from English to Indic languages. 
     Translate the following text from English to formal {target_language} with high accuracy, formal tone, 
@@ -64,14 +80,22 @@ def translate_text_gpt(text, target_language='Hindi'):
     of the target language. Use words with Sanskrit root. Provide best translation by self-evaluating 
     translation quality and also by backtranslating the translated text to the source language and 
     comparing it with the original text. 
-    DO not provide any extra text, only provide the best translation. Translate "Maxim" as "नियम".
+    DO not provide any extra text, only provide the best translation. {glossary_prompt}
     English text: {text}
     Translated text: 
     """
-    prompt = PromptTemplate(template=prompt_template, input_variables=["text", "target_language"])
+    prompt = PromptTemplate(template=prompt_template, input_variables=["text", "target_language", "glossary_prompt"])
+
+    prompt_text = prompt.format(text=text, target_language=target_language, 
+                                glossary_prompt=get_glossary_prompt(glossary_terms))
+
+    def send_request():
+        llm = ChatOpenAI(**GPT_CONFIG)
+        summary = llm.invoke(prompt_text)
+        return summary.content
 
-    summary = llm.invoke(prompt.format(text=text, target_language=target_language))
-    return summary.content
+    request = {**GPT_CONFIG, "prompt": prompt_text}
+    return api_recorder.call("gpt", request, send_request)
 
 
 def back_translate_text(text, source_language="Hindi"):
@@ -86,16 +110,19 @@ def back_translate_text(text, source_language="Hindi"):
         "Content-Type": "application/json"
     }
 
-    response = requests.post(url, json = payload, headers = headers)
+    def send_request():
+        response = requests.post(url, json = payload, headers = headers)
 
-    if response.status_code == 200:
-        response = response.json()
-        back_translated_text = response.get("translated_text", "")
-    
-    else:
-        print("Failed with status code:", response.status_code)
-    
-    return back_translated_text
+        if response.status_code == 200:
+            response = response.json()
+            back_translated_text = response.get("translated_text", "")
+        
+        else:
+            print("Failed with status code:", response.status_code)
+        
+        return back_translated_text
+
+    return api_recorder.call("translate_indic", payload, send_request)
 
 # if __name__ == "__main__":
 #     text = """